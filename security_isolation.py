@@ -12,6 +12,21 @@ import tempfile
 import hashlib
 from typing import Optional
 
+
+# 预先吸收公共前缀的哈希上下文，每次计算只需copy()后追加键名
+_KEY_HASH_BASE = hashlib.blake2b(b'secure_wallet_v1|', digest_size=16)
+
+
+def _hash_key(key: str) -> bytes:
+    """
+    计算内存存储的键名哈希
+    哈希仅用于隐藏键名，选用比SHA256更快的BLAKE2b
+    """
+    h = _KEY_HASH_BASE.copy()
+    h.update(key.encode())
+    return h.digest()
+
+
 class SecurityIsolation:
     """安全隔离核心类"""
     
@@ -41,24 +56,32 @@ class SecurityIsolation:
             data: 要写入的数据
         返回: 是否成功
         """
+        temp_path = None
         try:
-            # 使用临时文件原子写入
-            temp_path = filepath + '.tmp'
-            with open(temp_path, 'w', encoding='utf-8') as f:
+            # 使用唯一命名的临时文件原子写入，mkstemp创建时权限即为0600
+            fd, temp_path = tempfile.mkstemp(
+                dir=os.path.dirname(filepath) or '.',
+                prefix=os.path.basename(filepath) + '.',
+                suffix='.tmp',
+            )
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
                 f.write(data)
-            
-            # Windows系统设置文件权限
+
+            os.replace(temp_path, filepath)
+
+            # Windows系统设置文件只读属性
             if os.name == 'nt':
                 import win32api, win32con
-                win32api.SetFileAttributes(temp_path, win32con.FILE_ATTRIBUTE_READONLY)
-                os.replace(temp_path, filepath)
                 win32api.SetFileAttributes(filepath, win32con.FILE_ATTRIBUTE_READONLY)
-            else:
-                os.chmod(temp_path, 0o600)
-                os.replace(temp_path, filepath)
             return True
         except Exception as e:
             print(f"安全写入失败: {e}", file=sys.stderr)
+            # 清理未能替换到目标位置的临时文件
+            if temp_path is not None:
+                try:
+                    os.unlink(temp_path)
+                except FileNotFoundError:
+                    pass
             return False
     
     def store_in_memory(self, key: str, value: str) -> None:
@@ -68,9 +91,8 @@ class SecurityIsolation:
             key: 键名
             value: 要存储的值
         """
-        # 使用SHA256哈希作为内存键名
-        hashed_key = hashlib.sha256(key.encode()).hexdigest()
-        self._secure_memory[hashed_key] = value
+        # 使用BLAKE2b哈希作为内存键名
+        self._secure_memory[_hash_key(key)] = value
     
     def get_from_memory(self, key: str) -> Optional[str]:
         """
@@ -79,8 +101,7 @@ class SecurityIsolation:
             key: 键名
         返回: 存储的值或None
         """
-        hashed_key = hashlib.sha256(key.encode()).hexdigest()
-        return self._secure_memory.get(hashed_key)
+        return self._secure_memory.get(_hash_key(key))
     
     def cleanup(self) -> None:
         """清理安全资源"""
@@ -98,11 +119,12 @@ class SecurityIsolation:
                 print(f"清理临时目录失败: {e}", file=sys.stderr)
 
 
-def check_runtime_environment(verbose: bool = True) -> bool:
+def check_runtime_environment(verbose: bool = True, check_network: bool = False) -> bool:
     """
     检查运行时环境安全性
     参数:
         verbose: 是否显示详细检测结果
+        check_network: 是否探测外网连接(会产生网络请求，默认跳过)
     返回: 是否安全
     """
     try:
@@ -111,30 +133,33 @@ def check_runtime_environment(verbose: bool = True) -> bool:
             if verbose:
                 print("❌ 检测到调试器附加")
             return False
-            
-        # 检测网络连接
-        import socket
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.settimeout(1)
-        try:
-            s.connect(('8.8.8.8', 53))
-            if verbose:
-                print("❌ 检测到异常网络连接")
-            return False
-        except:
+
+        if not check_network:
             if verbose:
-                print("✅ 网络环境安全")
+                print("ℹ️ 网络检测: 已跳过")
             return True
-        finally:
-            s.close()
+
+        # 检测网络连接
+        import socket
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.settimeout(1)
+            if s.connect_ex(('8.8.8.8', 53)) == 0:
+                if verbose:
+                    print("❌ 检测到异常网络连接")
+                return False
+        if verbose:
+            print("✅ 网络环境安全")
+        return True
     except Exception:
         if verbose:
             print("❌ 环境检测异常")
         return False
 
-def display_module_status():
+def display_module_status(check_network: bool = False):
     """
     显示模块运行状态和安全检测结果
+    参数:
+        check_network: 是否执行外网连接探测
     """
     print("\n=== 安全模块状态检测 ===")
     print(f"✅ 文件加密模块: {'已加载'}")
@@ -142,7 +167,7 @@ def display_module_status():
     
     # 检查运行时环境
     print("\n=== 环境安全检测 ===")
-    check_runtime_environment()
+    check_runtime_environment(check_network=check_network)
     
     # 检查关键模块
     print("\n=== 关键模块检测 ===")
@@ -0,0 +1,36 @@
+"""
+钱包派生已知答案测试
+
+BIP32派生与EIP-55地址为手写实现，用标准测试助记词校验结果，
+保证导出的助记词导入钱包后能恢复出同一地址
+"""
+import pytest
+
+for _module in ('coincurve', 'Crypto.Hash.keccak', 'solders.keypair', 'mnemonic', 'xlsxwriter'):
+    pytest.importorskip(_module)
+
+import wallet_generator  # noqa: E402
+from coincurve import PrivateKey  # noqa: E402
+
+# Hardhat/Foundry等工具使用的标准测试助记词及其 m/44'/60'/0'/0/0 账户
+TEST_MNEMONIC = 'test test test test test test test test test test test junk'
+TEST_PRIVATE_KEY = '0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80'
+TEST_ADDRESS = '0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266'
+
+
+def test_derive_bip32_key_matches_known_vector():
+    seed = wallet_generator.mnemonic_to_seed(TEST_MNEMONIC)
+    key = wallet_generator.derive_bip32_key(seed, wallet_generator.ETH_DERIVATION_PATH)
+    assert '0x' + key.hex() == TEST_PRIVATE_KEY
+
+
+def test_eth_address_from_public_key_matches_known_vector():
+    key = bytes.fromhex(TEST_PRIVATE_KEY[2:])
+    public_key = PrivateKey(key).public_key.format(compressed=False)[1:]
+    assert wallet_generator.eth_address_from_public_key(public_key) == TEST_ADDRESS
+
+
+def test_generate_eth_wallet_matches_mnemonic(monkeypatch):
+    generator = wallet_generator.WalletGenerator('eth', 1)
+    monkeypatch.setattr(generator._mnemo, 'generate', lambda strength: TEST_MNEMONIC)
+    assert generator.generate_eth_wallet() == (TEST_ADDRESS, TEST_PRIVATE_KEY, TEST_MNEMONIC)
@@ -3,14 +3,84 @@
 """
 
 import os
+import csv
 import time
+import hmac
+import hashlib
 import argparse
-from typing import List, Dict
-from eth_account import Account   
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Tuple
+from coincurve import PrivateKey
+from Crypto.Hash import keccak
 from solders.keypair import Keypair
 from mnemonic import Mnemonic  # 新增助记词库
-import pandas as pd
-from openpyxl.utils import get_column_letter
+import xlsxwriter
+
+# 导出文件的列名，与生成器返回的元组顺序一致
+WALLET_COLUMNS = ('address', 'private_key', 'mnemonic')
+# 子进程每个任务生成的钱包数量
+GENERATION_BATCH_SIZE = 16
+# 后台写线程每次写出的钱包数量
+EXPORT_CHUNK_SIZE = 1024
+# 各列内容长度固定或有上界，直接按链类型给出列宽，无需扫描数据
+# 助记词为12个词，每词最长8个字符，加空格不超过107
+COLUMN_WIDTHS = {
+    'eth': {'address': 42, 'private_key': 66, 'mnemonic': 110},
+    'sol': {'address': 44, 'private_key': 64, 'mnemonic': 110},
+}
+# secp256k1曲线阶
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+# MetaMask等主流钱包默认的ETH派生路径 m/44'/60'/0'/0/0
+ETH_DERIVATION_PATH = (44 | 0x80000000, 60 | 0x80000000, 0x80000000, 0, 0)
+
+
+def eth_address_from_public_key(public_key: bytes) -> str:
+    """
+    由64字节未压缩公钥计算EIP-55校验和格式的ETH地址
+
+    Keccak256直接调用pycryptodome的C实现
+    """
+    address = keccak.new(digest_bits=256, data=public_key).hexdigest()[-40:]
+    checksum = keccak.new(digest_bits=256, data=address.encode()).hexdigest()
+    return '0x' + ''.join(
+        c.upper() if int(h, 16) >= 8 else c for c, h in zip(address, checksum)
+    )
+
+
+def mnemonic_to_seed(mnemonic: str) -> bytes:
+    """
+    按BIP39由助记词计算种子(无密码)
+
+    直接调用hashlib的OpenSSL实现PBKDF2-HMAC-SHA512，
+    英文词表均为ASCII字符，NFKD规范化可省略
+    """
+    return hashlib.pbkdf2_hmac('sha512', mnemonic.encode(), b'mnemonic', 2048)
+
+
+def derive_bip32_key(seed: bytes, path: tuple) -> bytes:
+    """
+    按BIP32从种子派生secp256k1私钥
+
+    参数:
+        seed: BIP39种子
+        path: 派生路径索引，硬化索引已加上0x80000000
+    返回: 32字节私钥
+    """
+    digest = hmac.new(b"Bitcoin seed", seed, hashlib.sha512).digest()
+    key, chain_code = digest[:32], digest[32:]
+    for index in path:
+        if index & 0x80000000:
+            data = b'\x00' + key
+        else:
+            data = PrivateKey(key).public_key.format(compressed=True)
+        digest = hmac.new(chain_code, data + index.to_bytes(4, 'big'), hashlib.sha512).digest()
+        child = (int.from_bytes(digest[:32], 'big') + int.from_bytes(key, 'big')) % SECP256K1_N
+        key, chain_code = child.to_bytes(32, 'big'), digest[32:]
+    return key
+
 
 class WalletGenerator:
     """钱包生成器"""
@@ -18,57 +88,189 @@ class WalletGenerator:
     def __init__(self, chain_type: str, count: int):
         self.chain_type = chain_type.lower()
         self.count = count
-        self.wallets = []
-
-    def generate_eth_wallet(self) -> Dict[str, str]:
-        Account.enable_unaudited_hdwallet_features()  # 启用未审计的HD钱包功能
-        mnemo = Mnemonic("english")
-        mnemonic = mnemo.generate(strength=128)
-        acct = Account.from_mnemonic(mnemonic)
-        return {
-            'address': acct.address,
-            'private_key': acct.key.hex(),
-            'mnemonic': mnemonic
-        }
-
-    def generate_sol_wallet(self) -> Dict[str, str]:
-        mnemo = Mnemonic("english")
-        mnemonic = mnemo.generate(strength=128)
+        self._mnemo = Mnemonic("english")  # 词表只加载一次
+
+    def generate_eth_wallet(self) -> Tuple[str, str, str]:
+        mnemonic = self._mnemo.generate(strength=128)
+        # 直接用libsecp256k1完成BIP32派生，保证助记词可导入钱包恢复同一地址
+        private_key = derive_bip32_key(mnemonic_to_seed(mnemonic), ETH_DERIVATION_PATH)
+        public_key = PrivateKey(private_key).public_key.format(compressed=False)[1:]
+        return (
+            eth_address_from_public_key(public_key),
+            '0x' + private_key.hex(),
+            mnemonic,
+        )
+
+    def generate_sol_wallet(self) -> Tuple[str, str, str]:
+        mnemonic = self._mnemo.generate(strength=128)
         # 使用from_seed方法替代已废弃的from_seed_and_entropy
-        kp = Keypair.from_seed(mnemo.to_seed(mnemonic)[:32])  # 取前32字节作为种子
-        return {
-            'address': str(kp.pubkey()),
-            'private_key': kp.secret().hex(),
-            'mnemonic': mnemonic
-        }
-
-    def run(self) -> List[Dict[str, str]]:
-        start_time = time.time()
-
-        for i in range(1, self.count + 1):
-            elapsed = time.time() - start_time
-            remaining = (elapsed / i) * (self.count - i)
-
-            wallet = (
-                self.generate_eth_wallet()
-                if self.chain_type == 'eth'
-                else self.generate_sol_wallet()
+        kp = Keypair.from_seed(mnemonic_to_seed(mnemonic)[:32])  # 取前32字节作为种子
+        return str(kp.pubkey()), kp.secret().hex(), mnemonic
+
+    def iter_wallets(self) -> Iterator[Tuple[str, str, str]]:
+        """
+        逐个产出(地址, 私钥, 助记词)，调用方可边生成边写出，无需缓存全部钱包
+
+        调用方提前停止迭代时会取消尚未开始的生成任务，不再等待全部生成完毕
+        """
+        start_time = time.monotonic()
+        last_print = 0.0
+        generated = 0
+
+        # 各钱包相互独立，按CPU核数多进程并行生成
+        workers = max(1, min(os.cpu_count() or 1, self.count))
+        batch_sizes = (
+            min(GENERATION_BATCH_SIZE, self.count - start)
+            for start in range(0, self.count, GENERATION_BATCH_SIZE)
+        )
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            # 在途批次数量有上限，内存占用与生成总数无关
+            pending = deque(
+                executor.submit(_generate_batch, self.chain_type, size)
+                for size in islice(batch_sizes, 2 * workers)
             )
-            self.wallets.append(wallet)
+            while pending:
+                try:
+                    batch = pending.popleft().result()
+                except Exception as e:
+                    raise WalletGenerationError(f"钱包生成失败: {e}") from e
+                for size in islice(batch_sizes, 1):
+                    pending.append(executor.submit(_generate_batch, self.chain_type, size))
+
+                yield from batch
+                generated += len(batch)
+
+                # 进度输出限频为每100ms一次，避免终端I/O成为瓶颈
+                now = time.monotonic()
+                if now - last_print >= 0.1 or generated == self.count:
+                    last_print = now
+                    remaining = ((now - start_time) / generated) * (self.count - generated)
+                    print(f"已生成 {generated}/{self.count} | 剩余时间: {remaining:.1f}s", end='\r')
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class WalletGenerationError(RuntimeError):
+    """子进程生成钱包失败"""
+
+
+_worker_generator = None
+
+
+def _generate_batch(chain_type: str, size: int) -> List[Tuple[str, str, str]]:
+    """
+    子进程中生成一批钱包，每个进程复用一个生成器实例
+    随机数来自os.urandom，各进程互不相关，无需单独播种
+    """
+    global _worker_generator
+    if _worker_generator is None or _worker_generator.chain_type != chain_type:
+        _worker_generator = WalletGenerator(chain_type, 0)
+    generate = (
+        _worker_generator.generate_eth_wallet
+        if chain_type == 'eth'
+        else _worker_generator.generate_sol_wallet
+    )
+    return [generate() for _ in range(size)]
+
+
+def _reserve_output_path(output_dir: str, filename: str) -> str:
+    """
+    在输出目录中原子地创建一个不与已有文件冲突的空文件
+
+    每次尝试只需一次O_CREAT|O_EXCL系统调用，冲突时自动追加序号
+    返回: 最终文件路径
+    """
+    base_name, ext = os.path.splitext(os.path.basename(filename))
+    final_path = os.path.join(output_dir, base_name + ext)
+    counter = 1
+    while True:
+        try:
+            os.close(os.open(final_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+            return final_path
+        except FileExistsError:
+            final_path = os.path.join(output_dir, f"{base_name}_{counter}{ext}")
+            counter += 1
+
+
+def _prepare_output_file(filename: str, chain_type: str) -> str:
+    """
+    创建链类型子目录并预留不冲突的输出文件
+    返回: 最终文件路径
+    """
+    output_dir = os.path.join(os.path.dirname(filename), f"{chain_type}_wallets")
+    os.makedirs(output_dir, exist_ok=True)
+    return _reserve_output_path(output_dir, filename)
+
+
+@contextmanager
+def _reserved_output_file(filename: str, chain_type: str) -> Iterator[str]:
+    """
+    预留输出文件供导出使用，导出未完成(异常或用户中断)时删除该文件
+    避免留下空文件或含部分私钥的残缺文件
+    """
+    filename = _prepare_output_file(filename, chain_type)
+    try:
+        yield filename
+    except BaseException:
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+        raise
+
 
-            print(f"已生成 {i}/{self.count} | 剩余时间: {remaining:.1f}s", end='\r')
-            time.sleep(0.5)
+def _restrict_file_permissions(filename: str) -> None:
+    """将导出文件设为仅当前用户可读，失败时仅打印警告"""
+    try:
+        if os.name == 'nt':
+            import win32api, win32con
+            win32api.SetFileAttributes(filename, win32con.FILE_ATTRIBUTE_READONLY)
+        else:
+            os.chmod(filename, 0o600)
+    except Exception as perm_error:
+        print(f"⚠️ 警告: 文件权限设置失败: {perm_error}")
 
-        return self.wallets
 
+def _write_in_background(
+    wallets: Iterable[Tuple[str, str, str]],
+    write_chunk: Callable[[List[Tuple[str, str, str]], int], None],
+) -> None:
+    """
+    按块收集钱包，交给单独的写线程写出（双缓冲）
 
-def export_to_excel(wallets: List[Dict[str, str]], filename: str) -> None:
+    主线程收集下一块时，写线程同时序列化上一块；写线程只有一个，各块按顺序写出
+    参数:
+        wallets: 可迭代的(地址, 私钥, 助记词)
+        write_chunk: 写出一块数据，第二个参数为该块首行在数据中的序号(从0开始)
+    """
+    wallets = iter(wallets)
+    written = 0
+    pending = None
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        for chunk in iter(lambda: list(islice(wallets, EXPORT_CHUNK_SIZE)), []):
+            # 最多一块在写，内存占用有上界，写入异常也能及时抛出
+            if pending is not None:
+                pending.result()
+            pending = writer.submit(write_chunk, chunk, written)
+            written += len(chunk)
+        if pending is not None:
+            pending.result()
+
+
+def export_to_excel(
+    wallets: Iterable[Tuple[str, str, str]],
+    filename: str,
+    chain_type: str,
+) -> None:
     """
     导出钱包信息到Excel文件，自动调整列宽
     
     参数:
-        wallets: 钱包列表，每个钱包包含address和private_key
+        wallets: 可迭代的(地址, 私钥, 助记词)，可直接传入生成器边生成边写出
         filename: 输出文件名
+        chain_type: 链类型(eth/sol)，决定输出子目录
     
     安全措施:
         1. 文件权限设置为仅当前用户可读
@@ -77,55 +279,61 @@ def export_to_excel(wallets: List[Dict[str, str]], filename: str) -> None:
         4. 自动创建链类型子目录
     """
     try:
-        df = pd.DataFrame(wallets)
-        
-        # 确保关键字段存在
-        required_fields = ['private_key', 'mnemonic']
-        for field in required_fields:
-            if field not in df.columns:
-                raise ValueError(f"钱包数据缺少{field}字段")
-                
-        # 创建链类型子目录
-        chain_type = "eth" if 'private_key' in df.columns and df['private_key'].str.startswith('0x').all() else "sol"
-        output_dir = os.path.join(os.path.dirname(filename), f"{chain_type}_wallets")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # 处理文件路径
-        base_name = os.path.join(output_dir, os.path.basename(filename).split('.')[0])
-        ext = os.path.splitext(filename)[1]
-        counter = 1
-        final_path = os.path.join(output_dir, filename)
-        while os.path.exists(final_path):
-            final_path = os.path.join(output_dir, f"{base_name}_{counter}{ext}")
-            counter += 1
-        filename = final_path
-
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Wallets')
-
-            worksheet = writer.sheets['Wallets']
-            
-            # 不再隐藏敏感列
-            
-            # 自动调整所有列宽
-            for col in df.columns:
-                col_idx = df.columns.get_loc(col)
-                max_len = max(df[col].astype(str).str.len().max(), len(col)) + 2
-                col_letter = get_column_letter(col_idx + 1)
-                worksheet.column_dimensions[col_letter].width = max_len
-        
-        # 设置文件权限(仅Windows)
-        try:
-            if os.name == 'nt':
-                import win32api, win32con
-                win32api.SetFileAttributes(filename, win32con.FILE_ATTRIBUTE_READONLY)
-            else:
-                os.chmod(filename, 0o600)
-        except Exception as perm_error:
-            print(f"⚠️ 警告: 文件权限设置失败: {perm_error}")
+        with _reserved_output_file(filename, chain_type) as filename:
+            # 常量内存模式：每行写入后即落盘，内存占用不随钱包数量增长
+            workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+            try:
+                worksheet = workbook.add_worksheet('Wallets')
+
+                widths = COLUMN_WIDTHS[chain_type]
+                for col_idx, name in enumerate(WALLET_COLUMNS):
+                    worksheet.set_column(col_idx, col_idx, widths[name] + 2)
+
+                worksheet.write_row(0, 0, WALLET_COLUMNS)
+
+                def write_chunk(chunk, first_row):
+                    for offset, row in enumerate(chunk, start=first_row + 1):
+                        worksheet.write_row(offset, 0, row)
+
+                _write_in_background(wallets, write_chunk)
+            finally:
+                workbook.close()
+
+            _restrict_file_permissions(filename)
+
+        print(f"\n导出成功: {filename}")
+        print("⚠️ 安全提示: 私钥已可见，请妥善保管文件")
+    except WalletGenerationError:
+        # 生成失败不属于导出问题，交由调用方处理
+        raise
+    except Exception as e:
+        print(f"\n导出失败: {e}")
+
+
+def export_to_csv(
+    wallets: Iterable[Tuple[str, str, str]],
+    filename: str,
+    chain_type: str,
+) -> None:
+    """
+    导出钱包信息到CSV文件，比Excel序列化快得多，适合程序读取
+
+    参数与安全措施同export_to_excel
+    """
+    try:
+        with _reserved_output_file(filename, chain_type) as filename:
+            with open(filename, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(WALLET_COLUMNS)
+                _write_in_background(wallets, lambda chunk, _: writer.writerows(chunk))
+
+            _restrict_file_permissions(filename)
 
         print(f"\n导出成功: {filename}")
         print("⚠️ 安全提示: 私钥已可见，请妥善保管文件")
+    except WalletGenerationError:
+        # 生成失败不属于导出问题，交由调用方处理
+        raise
     except Exception as e:
         print(f"\n导出失败: {e}")
 
@@ -166,6 +374,8 @@ def parse_args():
     parser = argparse.ArgumentParser(description="批量生成ETH或SOL钱包，并导出Excel")
     parser.add_argument('--chain', choices=['eth', 'sol'], help="链类型: eth 或 sol")
     parser.add_argument('--count', type=int, help="生成的钱包数量")
+    parser.add_argument('--format', choices=['xlsx', 'csv'], default='xlsx',
+                        help="导出格式: xlsx(默认) 或 csv")
     return parser.parse_args()
 
 
@@ -187,10 +397,12 @@ if __name__ == "__main__":
 
         print("\n开始生成钱包...")
         generator = WalletGenerator(chain, count)
-        wallets = generator.run()
 
-        filename = f"{chain}_wallets.xlsx"
-        export_to_excel(wallets, filename)
+        # 边生成边写入，不在内存中缓存全部钱包
+        filename = f"{chain}_wallets.{args.format}"
+        export = export_to_csv if args.format == 'csv' else export_to_excel
+        with closing(generator.iter_wallets()) as wallets:
+            export(wallets, filename, generator.chain_type)
 
     except KeyboardInterrupt:
         print("\n用户中断操作")